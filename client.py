@@ -178,42 +178,255 @@
 
 
 
-from mcp.client.streamable_http import streamablehttp_client
+from anyio.streams.memory import MemoryObjectReceiveStream, MemoryObjectSendStream
+from mcp.client.streamable_http import GetSessionIdCallback, streamablehttp_client
 from mcp import ClientSession
+from mcp.shared.message import SessionMessage
 from mcp.types import CallToolResult  # ✅ Correct import
-from contextlib import AsyncExitStack
+from pydantic import BaseModel
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import AbstractAsyncContextManager, AsyncExitStack, asynccontextmanager
+from typing import Self
 import asyncio
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+import httpx
+
+loop_factory: Callable[[], asyncio.AbstractEventLoop] | None
+try:
+    import uvloop  # ✅ Faster event loop (not available on Windows)
+    loop_factory = uvloop.new_event_loop
+except ImportError:
+    loop_factory = None
+
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+log.propagate = False  # printed by our own handler only, not again by the root logger's
+
+
+def start_logging() -> logging.handlers.QueueListener:
+    # ✅ Printing happens on a background thread, so the event loop never waits on stdout
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    return listener
+
+def make_http_client() -> httpx.AsyncClient:
+    # ✅ One keep-alive pool (HTTP/2 when the server offers it) for every request
+    return httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+        timeout=httpx.Timeout(30.0, read=300.0),  # same defaults MCP uses
+        follow_redirects=True,
+        http2=True,
+    )
+
+ReadStream = MemoryObjectReceiveStream[SessionMessage | Exception]
+WriteStream = MemoryObjectSendStream[SessionMessage]
 
 class MCPClient:
-    def __init__(self, url):
-        self.url = url
-        self.stack = AsyncExitStack()
-        self._sess = None
+    __slots__ = (  # ✅ No per-instance __dict__; attribute access is a fixed offset
+        "url", "ws_url", "_loop", "_owner", "_closing", "_sess", "_lock", "_users",
+        "_http", "_tools_cache", "_tools_ttl",
+    )
 
-    async def __aenter__(self):
-        read, write, _ = await self.stack.enter_async_context(
-            streamablehttp_client(self.url)
-        )
-        self._sess = await self.stack.enter_async_context(
-            ClientSession(read, write)
-        )
-        await self._sess.initialize()
+    def __init__(self, url: str, ws_url: str | None = None) -> None:
+        self.url = url
+        self.ws_url = ws_url  # e.g. "ws://localhost:8000/mcp/ws", if the server exposes one
+        # the task that holds session() open, shared by every entry
+        self._owner: asyncio.Task[None] | None = None
+        self._closing: asyncio.Event | None = None  # set by the last __aexit__ to let the owner close
+        self._sess: ClientSession | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None  # loop that _lock belongs to
+        self._lock = asyncio.Lock()  # ✅ Only one coroutine runs the handshake
+        self._users = 0
+        self._http = make_http_client()
+        self._tools_cache: tuple[float, tuple[str, ...]] | None = None  # (fetched_at, names)
+        self._tools_ttl = 30.0
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Self]:
+        # ✅ Plain nested async with: transport and session close in reverse order on the way out
+        # websocket yields (read, write); HTTP also yields a session-id getter
+        transport: AbstractAsyncContextManager[
+            tuple[ReadStream, WriteStream] | tuple[ReadStream, WriteStream, GetSessionIdCallback]
+        ]
+        if self.ws_url:  # ✅ One long-lived WebSocket, no per-call HTTP framing
+            from mcp.client.websocket import websocket_client  # needs the "ws" extra
+            transport = websocket_client(self.ws_url)
+        else:
+            if self._http.is_closed:  # the transport closes the pool with the session
+                self._http = make_http_client()
+            transport = streamablehttp_client(self.url, httpx_client_factory=self._http_factory)
+        async with transport as (read, write, *_):
+            async with ClientSession(read, write) as sess:
+                await sess.initialize()
+                self._sess = sess
+                try:
+                    try:
+                        await self.list_tool_names()  # ✅ Warm-up: pooled connection and tool cache ready early
+                    except Exception:  # best effort, the session itself is fine
+                        log.warning("warm-up failed", exc_info=True)
+                    yield self
+                finally:
+                    self._sess = None
+                    self._tools_cache = None
+
+    def _http_factory(
+        self,
+        headers: dict[str, str] | None = None,
+        timeout: httpx.Timeout | None = None,
+        auth: httpx.Auth | None = None,
+    ) -> httpx.AsyncClient:
+        # The transport sends its headers with every request and we never pass auth,
+        # so hand back the shared pool as-is (its timeouts already match MCP's)
+        return self._http
+
+    def _require_sess(self) -> ClientSession:
+        if self._sess is None:
+            raise RuntimeError("not connected")
+        return self._sess
+
+    async def _hold_session(self, ready: asyncio.Future[None], closing: asyncio.Event) -> None:
+        # ✅ The transport is an anyio task group, so it must be opened and closed in the
+        # same task; this task does both, whichever tasks enter and exit the client
+        try:
+            async with self.session():
+                if not ready.done():  # the caller may have been cancelled meanwhile
+                    ready.set_result(None)
+                await closing.wait()
+        except Exception as exc:
+            if ready.done():
+                raise  # failed while closing, reported to the last __aexit__
+            ready.set_exception(exc)  # failed while connecting, reported to __aenter__
+        finally:
+            if not ready.done():
+                ready.cancel()
+
+    def _owner_done(self, owner: asyncio.Task[None]) -> None:
+        # Runs when the owner task ends; only an exit nobody asked for is news
+        if self._owner is owner and not owner.cancelled() and owner.exception() is not None:
+            log.warning("MCP session closed unexpectedly", exc_info=owner.exception())
+
+    async def __aenter__(self) -> Self:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # ✅ asyncio locks belong to one loop, e.g. a second asyncio.run()
+            if self._owner is not None and not self._owner.done():
+                raise RuntimeError("MCPClient is connected from another event loop")
+            self._loop, self._lock, self._owner, self._users = loop, asyncio.Lock(), None, 0
+        async with self._lock:
+            if self._owner is not None and self._owner.done():
+                self._owner = None  # the session died mid-use (already logged), reconnect
+            if self._owner is None:  # ✅ Connect on first entry, reuse the session after that
+                ready: asyncio.Future[None] = loop.create_future()
+                closing = asyncio.Event()
+                owner = asyncio.create_task(self._hold_session(ready, closing))
+                try:
+                    await ready
+                except BaseException:
+                    owner.cancel()  # don't make a cancelled caller wait out the handshake
+                    await asyncio.wait([owner])  # let it unwind, without raising its result here
+                    if not owner.cancelled():
+                        owner.exception()  # already reported through ready
+                    raise
+                owner.add_done_callback(self._owner_done)
+                self._owner, self._closing = owner, closing
+            self._users += 1
         return self
 
-    async def __aexit__(self, *args):
-        await self.stack.aclose()
-
-    async def list_tool_names(self):
-        tools = (await self._sess.list_tools()).tools
-        return [tool.name for tool in tools]  # ✅ Only names
+    async def __aexit__(self, *args: object) -> None:
+        async with self._lock:
+            self._users -= 1
+            if self._users == 0:  # ✅ Last user out closes the shared session
+                owner, self._owner = self._owner, None
+                if self._closing is not None:
+                    self._closing.set()
+                if owner is not None and not owner.done():
+                    await owner
+
+    async def list_tool_names(self) -> tuple[str, ...]:
+        now = time.monotonic()
+        if self._tools_cache and now - self._tools_cache[0] < self._tools_ttl:
+            return self._tools_cache[1]  # ✅ Served from memory, no tools/list round-trip
+        tools = (await self._require_sess().list_tools()).tools
+        names = tuple(sys.intern(tool.name) for tool in tools)  # ✅ Only names, safe to share
+        self._tools_cache = (now, names)
+        return names
+
+    def invalidate_tools(self) -> None:
+        # Call this when you know the server's tools changed
+        self._tools_cache = None
     
-    async def call_tool(self, tool_name: str, tool_input: dict) -> CallToolResult | None:
-        return await self._sess.call_tool(tool_name, tool_input)  # ✅ Fixed _sess usage
-
-async def main():
-    async with MCPClient("http://localhost:8000/mcp") as client:
+    async def call_tool(self, tool_name: str, tool_input: dict) -> CallToolResult:
+        return await self._require_sess().call_tool(tool_name, tool_input)  # ✅ Fixed _sess usage
+
+    async def call_tools(
+        self, calls: list[tuple[str, dict]], concurrency: int = 64
+    ) -> list[CallToolResult]:
+        # ✅ Run the calls concurrently; each JSON-RPC request has its own id to match the reply.
+        # Only `concurrency` worker tasks exist, each pulling the next call when it is free,
+        # so tasks and in-flight requests stay bounded however long `calls` is.
+        # On failure the first error is raised, like a plain await would, with every
+        # failure in the ExceptionGroup as its __cause__.
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        call_tool = self.bind_call_tool()
+        jobs = enumerate(calls)  # shared by every worker
+        results: dict[int, CallToolResult] = {}
+
+        async def worker() -> None:
+            for i, (tool_name, tool_input) in jobs:
+                results[i] = await call_tool(tool_name, tool_input)
+
+        try:
+            async with asyncio.TaskGroup() as tg:  # one failure cancels the rest
+                for _ in range(min(concurrency, len(calls))):
+                    tg.create_task(worker())
+        except ExceptionGroup as group:
+            raise group.exceptions[0] from group
+        return [results[i] for i in range(len(calls))]  # same order as `calls`
+
+    def bind_call_tool(self) -> Callable[..., Awaitable[CallToolResult]]:
+        # ✅ For hot loops: ct = client.bind_call_tool(), then await ct(name, args)
+        # Only valid while this session is open
+        return self._require_sess().call_tool
+
+class Greeting(BaseModel):
+    result: str  # shape of get_greeting's structuredContent
+
+CLIENT = MCPClient("http://localhost:8000/mcp")  # ✅ One client for the whole process
+
+async def main() -> None:
+    async with AsyncExitStack() as app:
+        client = await app.enter_async_context(CLIENT)  # ✅ Handshake once at startup, closed on shutdown
         # Example: Call a tool
         tool_call = await client.call_tool("get_greeting", {"name": "Alice"})
-        print("Tool output:", tool_call.structuredContent)  # ✅ Accessing result directly
+        log.info("Tool output: %r", tool_call.structuredContent)  # ✅ Accessing result directly
 
-asyncio.run(main())
+        # Example: Call several tools concurrently
+        tool_calls = await client.call_tools(
+            [("get_greeting", {"name": name}) for name in ("Bob", "Carol", "Dave")]
+        )
+        succeeded = []
+        for tool_call in tool_calls:
+            if tool_call.isError:  # failed calls carry an error message, not structuredContent
+                log.warning("Tool failed: %s", tool_call.content)
+            else:
+                succeeded.append(tool_call)
+        # ✅ Validate on worker threads so the event loop stays free for other requests
+        greetings = await asyncio.gather(
+            *(asyncio.to_thread(Greeting.model_validate, tool_call.structuredContent)
+              for tool_call in succeeded)
+        )
+        for greeting in greetings:
+            log.info("Tool output: %s", greeting.result)
+
+if __name__ == "__main__":
+    listener = start_logging()
+    try:
+        asyncio.run(main(), loop_factory=loop_factory)
+    finally:
+        listener.stop()  # flush whatever is still queued
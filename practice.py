@@ -56,24 +56,41 @@
 
 
 import asyncio
-from contextlib import AsyncExitStack
+import logging
+import logging.handlers
+import queue
+import sys
 
+log = logging.getLogger(__name__)
+log.setLevel(logging.INFO)
+log.propagate = False  # printed by our own handler only, not again by the root logger's
 
-async def get_connection(name):
+
+def start_logging() -> logging.handlers.QueueListener:
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    log.addHandler(logging.handlers.QueueHandler(log_queue))
+    listener = logging.handlers.QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+    listener.start()
+    return listener
+
+
+def get_connection(name):  # ✅ Plain function: the only await left is __aenter__
     class ctx:
+        __slots__ = ()  # no state of its own, it only closes over name
+
         async def __aenter__(self):
-            print(f"ENTER...{name}")
+            log.info("ENTER...%s", name)
             return name
         async def __aexit__(self, exc_type, exc_value, traceback):
-            print(f"EXIT! {name}")
+            log.info("EXIT! %s", name)
     return ctx()        
 
 
 #  First Step:
 
 # async def main():
-#     async with await get_connection("A") as a:
-#         async with await get_connection("B") as b:
+#     async with get_connection("A") as a:
+#         async with get_connection("B") as b:
 #             print(f"Using connection: {a} and {b}")
 #     print("Connection closed.")
 
@@ -84,8 +101,8 @@ async def get_connection(name):
 
 # async def main():
 #     async with AsyncExitStack() as stack:
-#         a = await stack.enter_async_context(await get_connection("A"))
-#         b = await stack.enter_async_context(await get_connection("B"))
+#         a = await stack.enter_async_context(get_connection("A"))
+#         b = await stack.enter_async_context(get_connection("B"))
 #         print(f"Using connection: {a} and {b}")
 #     print("Connection closed.")
 
@@ -94,19 +111,81 @@ async def get_connection(name):
 
 # --------------------------------- Fourth Step:
 
-async def main():
-    async with AsyncExitStack() as stack:
-        a = await stack.enter_async_context(await get_connection("A"))
-        if a == "A":
-          b = await stack.enter_async_context(await get_connection("B"))
-          print(f"Using connection: {a} and {b}")
+class FastStack:
+    # ✅ Same idea as AsyncExitStack, but just a list of exit functions called newest-first
+    __slots__ = ("_exits",)
+
+    def __init__(self):
+        self._exits = []
+
+    async def enter_async_context(self, cm):
+        value = await cm.__aenter__()
+        self._exits.append(cm.__aexit__)  # only pushed once it really entered
+        return value
+
+    def push_async_callback(self, callback):
+        self._exits.append(lambda *exc: callback())
+
+    async def aclose(self):
+        await self.__aexit__(None, None, None)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        # ✅ Like AsyncExitStack: each exit sees the exception still in flight and may suppress it
+        received = exc_value is not None
+        pending = exc_value
+        frame_exc = sys.exc_info()[1]  # what a raise inside an exit gets as __context__ by itself
+        while self._exits:
+            exit_fn = self._exits.pop()
+            try:
+                if pending is None:
+                    suppress = await exit_fn(None, None, None)
+                else:
+                    suppress = await exit_fn(type(pending), pending, pending.__traceback__)
+                if suppress:
+                    pending = None
+            except BaseException as new_exc:  # keep closing the rest with the new error
+                if pending is not None and new_exc is not pending:
+                    # ✅ End its __context__ chain at the earlier error, as nested async with would
+                    exc = new_exc
+                    while exc.__context__ is not pending:
+                        if exc.__context__ is None or exc.__context__ is frame_exc:
+                            exc.__context__ = pending
+                            break
+                        exc = exc.__context__
+                pending = new_exc
+        if pending is None:
+            return received  # True if the body's exception was suppressed
+        if pending is exc_value:
+            return False  # the body's exception carries on as usual
+        context = pending.__context__
+        try:
+            raise pending
+        finally:
+            pending.__context__ = context  # raising here would re-chain it onto the body's error
 
 
+async def main():
+    async with FastStack() as stack:
         async def custom_cleanup():
-             print("Custom cleanup logic here.")
-             
-        stack.push_async_callback(custom_cleanup)
-        print(f"Doing with {a} and {b if 'b' in locals() else 'no B'}" )
+             log.info("Custom cleanup logic here.")
+
+        stack.push_async_callback(custom_cleanup)  # ✅ Registered first, so it runs even if a step below fails
+
+        a = await stack.enter_async_context(get_connection("A"))
+        b = None
+        if a == "A":
+          b = await stack.enter_async_context(get_connection("B"))
+          log.info("Using connection: %s and %s", a, b)
+
+        log.info("Doing with %s and %s", a, b if b is not None else 'no B')
 
 
-asyncio.run(main())    
\ No newline at end of file
+if __name__ == "__main__":
+    listener = start_logging()
+    try:
+        asyncio.run(main())
+    finally:
+        listener.stop()  # flush whatever is still queued
@@ -0,0 +1,235 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import anyio
+import pytest
+
+import client
+
+
+@asynccontextmanager
+async def fake_session(self):
+    # Like the real transport: an anyio task group, which must be exited in the task that entered it
+    async with anyio.create_task_group():
+        self._sess = object()
+        try:
+            yield self
+        finally:
+            self._sess = None
+
+
+def test_enter_and_exit_from_different_tasks(monkeypatch):
+    monkeypatch.setattr(client.MCPClient, "session", fake_session)
+    mcp_client = client.MCPClient("http://localhost:8000/mcp")
+
+    async def scenario():
+        a_entered, b_entered, a_exited = asyncio.Event(), asyncio.Event(), asyncio.Event()
+
+        async def task_a():
+            await mcp_client.__aenter__()
+            a_entered.set()
+            await b_entered.wait()
+            await mcp_client.__aexit__(None, None, None)
+            a_exited.set()
+
+        async def task_b():
+            await a_entered.wait()
+            await mcp_client.__aenter__()
+            sess = mcp_client._sess
+            b_entered.set()
+            await a_exited.wait()
+            assert mcp_client._sess is sess  # still open after A left
+            await mcp_client.__aexit__(None, None, None)  # last exit, from another task
+
+        await asyncio.gather(task_a(), task_b())
+
+    asyncio.run(scenario())
+    assert mcp_client._sess is None
+    assert mcp_client._owner is None
+    assert mcp_client._users == 0
+
+
+class FakeClientSession:
+    handshake = 0.0  # seconds initialize() takes
+    opened = []
+
+    def __init__(self, read, write):
+        self.list_tools_calls = 0
+        self.closed = False
+        FakeClientSession.opened.append(self)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    async def initialize(self):
+        await asyncio.sleep(self.handshake)
+
+    async def list_tools(self):
+        self.list_tools_calls += 1
+        return SimpleNamespace(tools=[SimpleNamespace(name="greet")])
+
+
+def fake_transport(broken=None):
+    # Stands in for streamablehttp_client; setting `broken` fails its reader like a dropped stream
+    @asynccontextmanager
+    async def transport(url, httpx_client_factory=None):
+        async with anyio.create_task_group() as tg:
+            if broken is not None:
+                async def reader():
+                    await broken.wait()
+                    raise ConnectionError("stream closed")
+                tg.start_soon(reader)
+            yield None, None, None
+            tg.cancel_scope.cancel()
+    return transport
+
+
+@pytest.fixture
+def fake_mcp(monkeypatch):
+    monkeypatch.setattr(FakeClientSession, "opened", [])
+    monkeypatch.setattr(client, "ClientSession", FakeClientSession)
+    monkeypatch.setattr(client, "streamablehttp_client", fake_transport())
+    return monkeypatch
+
+
+def test_cancelling_aenter_during_handshake(fake_mcp):
+    fake_mcp.setattr(FakeClientSession, "handshake", 10.0)
+    mcp_client = client.MCPClient("http://localhost:8000/mcp")
+
+    async def scenario():
+        entering = asyncio.create_task(mcp_client.__aenter__())
+        await asyncio.sleep(0.01)
+        entering.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(entering, 1)  # promptly, not after the handshake
+
+    asyncio.run(scenario())
+    assert mcp_client._owner is None
+    assert mcp_client._users == 0
+    assert [sess.closed for sess in FakeClientSession.opened] == [True]
+
+
+def test_reconnects_after_the_session_dies(fake_mcp):
+    mcp_client = client.MCPClient("http://localhost:8000/mcp")
+    errors = []
+
+    async def scenario():
+        asyncio.get_running_loop().set_exception_handler(lambda loop, ctx: errors.append(ctx))
+        broken = asyncio.Event()
+        fake_mcp.setattr(client, "streamablehttp_client", fake_transport(broken))
+        await mcp_client.__aenter__()
+        dead = mcp_client._owner
+        broken.set()
+        await asyncio.wait([dead])
+        assert mcp_client._sess is None
+
+        fake_mcp.setattr(client, "streamablehttp_client", fake_transport())
+        async with mcp_client:  # a new user gets a fresh session
+            assert mcp_client._owner is not dead
+            assert mcp_client._sess is FakeClientSession.opened[-1]
+            assert await mcp_client.list_tool_names() == ("greet",)
+        await mcp_client.__aexit__(None, None, None)  # the first user leaves too
+        assert mcp_client._owner is None
+
+    asyncio.run(scenario())
+    assert len(FakeClientSession.opened) == 2
+    assert errors == []  # the dead owner's exception was retrieved
+
+
+def test_reused_across_event_loops(fake_mcp):
+    mcp_client = client.MCPClient("http://localhost:8000/mcp")
+
+    async def enter_twice():
+        async def use():
+            async with mcp_client:
+                await asyncio.sleep(0)
+        await asyncio.gather(use(), use())  # contends for the lock, binding it to this loop
+
+    asyncio.run(enter_twice())
+    asyncio.run(enter_twice())
+    assert len(FakeClientSession.opened) == 2
+    assert mcp_client._sess is None
+
+
+def test_tool_names_are_cached_until_expired_invalidated_or_closed(fake_mcp):
+    now = [1000.0]
+    fake_mcp.setattr(client.time, "monotonic", lambda: now[0])
+    mcp_client = client.MCPClient("http://localhost:8000/mcp")
+
+    async def scenario():
+        async with mcp_client:
+            sess = FakeClientSession.opened[-1]
+            assert sess.list_tools_calls == 1  # the warm-up
+            assert await mcp_client.list_tool_names() == ("greet",)
+            assert sess.list_tools_calls == 1
+            now[0] += mcp_client._tools_ttl - 0.1
+            await mcp_client.list_tool_names()
+            assert sess.list_tools_calls == 1
+            now[0] += 0.2  # past the TTL
+            await mcp_client.list_tool_names()
+            assert sess.list_tools_calls == 2
+            mcp_client.invalidate_tools()
+            await mcp_client.list_tool_names()
+            assert sess.list_tools_calls == 3
+        assert mcp_client._tools_cache is None  # dropped with the session
+        async with mcp_client:
+            assert FakeClientSession.opened[-1].list_tools_calls == 1
+
+    asyncio.run(scenario())
+
+
+class FakeSess:
+    def __init__(self, fail_on=()):
+        self.fail_on = fail_on
+        self.in_flight = 0
+        self.peak = 0
+
+    async def call_tool(self, tool_name, tool_input):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0)
+            if tool_input["n"] in self.fail_on:
+                raise KeyError(tool_name)
+            return tool_input["n"]
+        finally:
+            self.in_flight -= 1
+
+
+def test_call_tools_keeps_order_and_bounds_in_flight():
+    mcp_client = client.MCPClient("http://localhost:8000/mcp")
+    mcp_client._sess = sess = FakeSess()
+    calls = [("echo", {"n": n}) for n in range(50)]
+    assert asyncio.run(mcp_client.call_tools(calls, concurrency=4)) == list(range(50))
+    assert sess.peak == 4
+
+
+def test_call_tools_rejects_zero_concurrency():
+    mcp_client = client.MCPClient("http://localhost:8000/mcp")
+    mcp_client._sess = FakeSess()
+    with pytest.raises(ValueError):
+        asyncio.run(mcp_client.call_tools([("echo", {"n": 1})], concurrency=0))
+
+
+def test_call_tools_raises_a_single_failure_unwrapped():
+    mcp_client = client.MCPClient("http://localhost:8000/mcp")
+    mcp_client._sess = FakeSess(fail_on={3})
+    with pytest.raises(KeyError) as info:
+        asyncio.run(mcp_client.call_tools([("echo", {"n": n}) for n in range(10)], concurrency=2))
+    assert isinstance(info.value.__cause__, ExceptionGroup)
+    assert info.value.__cause__.exceptions == (info.value,)
+
+
+def test_call_tools_raises_the_first_of_several_failures():
+    mcp_client = client.MCPClient("http://localhost:8000/mcp")
+    mcp_client._sess = FakeSess(fail_on={0, 1})  # both workers fail in the same tick
+    with pytest.raises(KeyError) as info:
+        asyncio.run(mcp_client.call_tools([("echo", {"n": n}) for n in range(10)], concurrency=2))
+    group = info.value.__cause__
+    assert isinstance(group, ExceptionGroup)
+    assert len(group.exceptions) == 2
+    assert group.exceptions[0] is info.value
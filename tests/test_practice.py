@@ -0,0 +1,99 @@
+import asyncio
+from contextlib import AsyncExitStack
+
+import pytest
+
+import practice
+
+
+class Exit:
+    def __init__(self, name, raises=None, suppress=False):
+        self.name = name
+        self.raises = raises
+        self.suppress = suppress
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        self.log.append((self.name, describe(exc_value)))
+        if self.raises is not None:
+            raise self.raises(self.name)
+        return self.suppress
+
+
+def describe(exc):
+    return None if exc is None else (type(exc).__name__, str(exc))
+
+
+def chain(exc):
+    # the error and everything it was raised during, newest first
+    seen = []
+    while exc is not None:
+        seen.append(describe(exc))
+        exc = exc.__context__
+    return seen
+
+
+async def run(stack_type, exits, body=None):
+    log = []
+    try:
+        async with stack_type() as stack:
+            for exit_ in exits:
+                exit_.log = log
+                await stack.enter_async_context(exit_)
+            if body is not None:
+                raise body("body")
+    except Exception as exc:
+        return chain(exc), log
+    return None, log
+
+
+CASES = {
+    "clean": ([Exit("a"), Exit("b")], None),
+    "passes through": ([Exit("a"), Exit("b")], ValueError),
+    "suppressed": ([Exit("a"), Exit("b", suppress=True)], ValueError),
+    "replaced": ([Exit("a"), Exit("b", raises=TypeError)], ValueError),
+    "replaced then suppressed": ([Exit("a", suppress=True), Exit("b", raises=TypeError)], ValueError),
+    "chained": ([Exit("a", raises=KeyError), Exit("b", raises=TypeError)], None),
+    "chained onto the body": ([Exit("a", raises=KeyError), Exit("b", raises=TypeError)], ValueError),
+}
+
+
+async def run_nested(exits, body=None):
+    # the same exits as plain nested async with blocks
+    log = []
+
+    async def enter(rest):
+        if not rest:
+            if body is not None:
+                raise body("body")
+            return
+        rest[0].log = log
+        async with rest[0]:
+            await enter(rest[1:])
+
+    try:
+        await enter(exits)
+    except Exception as exc:
+        return chain(exc), log
+    return None, log
+
+
+# AsyncExitStack loses the first exit's error here: nothing else is being handled when
+# the second exit raises, so it leaves its __context__ at None
+ASYNC_EXIT_STACK_DIFFERS = {"chained"}
+
+
+@pytest.mark.parametrize("case", [case for case in CASES if case not in ASYNC_EXIT_STACK_DIFFERS])
+def test_fast_stack_matches_async_exit_stack(case):
+    exits, body = CASES[case]
+    expected = asyncio.run(run(AsyncExitStack, exits, body))
+    assert asyncio.run(run(practice.FastStack, exits, body)) == expected
+
+
+@pytest.mark.parametrize("case", CASES)
+def test_fast_stack_matches_nested_async_with(case):
+    exits, body = CASES[case]
+    expected = asyncio.run(run_nested(exits, body))
+    assert asyncio.run(run(practice.FastStack, exits, body)) == expected